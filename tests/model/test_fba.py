@@ -6,20 +6,34 @@
 :Copyright: 2018, Karr Lab
 :License: MIT
 """
+from unittest import mock
 from wc_onto import onto
 import os
 import unittest
 import wc_lang
 import wc_lang.io
+import wc_analysis.core
 import wc_analysis.model.fba
 
 
+MODEL_FILENAME = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'test_model.xlsx')
+
+
+def load_model():
+    return wc_lang.io.Reader().run(MODEL_FILENAME)[wc_lang.Model][0]
+
+
 class FbaModelAnalysisTestCase(unittest.TestCase):
-    MODEL_FILENAME = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'test_model.xlsx')
+    MODEL_FILENAME = MODEL_FILENAME
     RNX_ID_PREFIX = 'rxn'
     SPECIES_ID_PREFIX = 'spec_type'
     default_flux_max = 10000
 
+    @classmethod
+    def setUpClass(cls):
+        # read the wc model once; tests modify copies of it
+        cls.template_model = load_model()
+
     def rxn_id(self, n):
         return "{}_{}".format(self.RNX_ID_PREFIX, n)
 
@@ -51,47 +65,56 @@ class FbaModelAnalysisTestCase(unittest.TestCase):
         self.id_idx = 0
         self.model_analysis = wc_analysis.model.fba.FbaModelAnalysis(self.model)
 
-    def make_reaction(self, submodel, reactant, product, **kwargs):
-        reversible = True
-        if 'reversible' in kwargs:
-            reversible = kwargs['reversible']
-        
-        flux_max = self.default_flux_max
-        if 'flux_max' in kwargs:
-            flux_max = kwargs['flux_max']
-
+    def make_flux_bounds(self, submodel, flux_max):
         flux_bounds = wc_lang.FluxBounds(max=flux_max)
         for rxn in submodel.model.reactions:
             if rxn.flux_bounds and rxn.flux_bounds.serialize() == flux_bounds.serialize():
-                flux_bounds = rxn.flux_bounds
-                break
+                return rxn.flux_bounds
+        return flux_bounds
 
-        rxn = submodel.reactions.create(id=self.next_id(), reversible=reversible, 
-            flux_bounds=flux_bounds)
-        rxn.participants.create(species=reactant, coefficient=-1)
-        rxn.participants.create(species=product, coefficient=1)
+    def make_reaction(self, submodel, reactant, product, flux_bounds=None, **kwargs):
+        # make a reaction, without adding it to `submodel`
+        reversible = kwargs.get('reversible', True)
+        if flux_bounds is None:
+            flux_bounds = self.make_flux_bounds(submodel, kwargs.get('flux_max', self.default_flux_max))
+
+        return wc_lang.Reaction(id=self.next_id(), reversible=reversible, flux_bounds=flux_bounds,
+                                participants=[wc_lang.SpeciesCoefficient(species=reactant, coefficient=-1),
+                                              wc_lang.SpeciesCoefficient(species=product, coefficient=1)])
 
     def create_reaction_network(self, submodel, network_type, **kwargs):
         # make networks of reactions with 1 reactant and 1 product
-        # first delete all Reactions
-        submodel.reactions = []
         if network_type == 'ring':
             # kwargs options: num_rxn, reversible, flux_max
             species = self.species
             if len(species) < kwargs['num_rxn']:
                 self.fail("not enough species, len(species) < kwargs['num_rxn']")
+            flux_bounds = self.make_flux_bounds(submodel, kwargs.get('flux_max', self.default_flux_max))
+            rxns = []
             for reactant_idx in range(kwargs['num_rxn']):
                 product_idx = (reactant_idx+1) % kwargs['num_rxn']
-                self.make_reaction(submodel, species[reactant_idx], species[product_idx], **kwargs)
+                rxns.append(self.make_reaction(submodel, species[reactant_idx], species[product_idx],
+                                               flux_bounds=flux_bounds, **kwargs))
         else:
-            self.Fail("Unknown network type: {}".format(network_type))
+            self.fail("Unknown network type: {}".format(network_type))
+
+        # replace all Reactions
+        submodel.reactions = rxns
+
+    def test_get_rxn_participants(self):
+        rxn = self.make_reaction(self.dfba_submodel, self.species[0], self.species[1])
+        rxn.participants.append(wc_lang.SpeciesCoefficient(species=self.species[0], coefficient=-1))
+        rxn_participants = self.model_analysis.get_rxn_participants([rxn])
+        self.assertEqual(rxn_participants[rxn].reactants, (self.species[0],))
+        self.assertEqual(rxn_participants[rxn].products, (self.species[1],))
+        self.assertEqual(rxn_participants[rxn].participants, (self.species[0], self.species[1]))
 
     def test_get_inactive_reactions(self):
         # make ring of 3 irreversible reactions
         self.create_reaction_network(self.dfba_submodel, 'ring', **{'num_rxn': 3, 'reversible': False})
 
         # no dead end species -> no inactive reactions
-        self.assertEqual(self.model_analysis.get_inactive_rxns(self.dfba_submodel, (set(), set())), [])
+        self.assertEqual(self.model_analysis.get_inactive_rxns(self.dfba_submodel, (set(), set())), set())
 
         # one dead end species -> 2 inactive reactions
         first_specie = self.species[0]
@@ -123,10 +146,8 @@ class FbaModelAnalysisTestCase(unittest.TestCase):
                 product = part.species
         del self.dfba_submodel.reactions[0]
         species_not_consumed, species_not_produced = model_analysis.get_dead_end_species(self.dfba_submodel, set())
-        self.assertEqual(species_not_consumed.pop(), reactant)
-        self.assertEqual(species_not_produced.pop(), product)
-        self.assertFalse(species_not_consumed)
-        self.assertFalse(species_not_produced)
+        self.assertEqual(list(species_not_consumed), [reactant])
+        self.assertEqual(list(species_not_produced), [product])
 
         # make ring of 4 irreversible reactions
         self.create_reaction_network(self.dfba_submodel, 'ring', **{'num_rxn': 4, 'reversible': False})
@@ -135,10 +156,13 @@ class FbaModelAnalysisTestCase(unittest.TestCase):
         #   species_not_produced = first reaction's product
         species_not_consumed, species_not_produced = model_analysis.get_dead_end_species(self.dfba_submodel,
                                                                                          set([self.dfba_submodel.reactions[0]]))
-        self.assertEqual(species_not_consumed.pop(), reactant)
-        self.assertEqual(species_not_produced.pop(), product)
-        self.assertFalse(species_not_consumed)
-        self.assertFalse(species_not_produced)
+        self.assertEqual(list(species_not_consumed), [reactant])
+        self.assertEqual(list(species_not_produced), [product])
+        dead_end_species = list(model_analysis.iter_dead_end_species(self.dfba_submodel,
+                                                                     set([self.dfba_submodel.reactions[0]])))
+        self.assertEqual(len(dead_end_species), 2)
+        self.assertIn((reactant, True, False), dead_end_species)
+        self.assertIn((product, False, True), dead_end_species)
 
         # make ring of reversible reactions
         self.create_reaction_network(self.dfba_submodel, 'ring', **{'num_rxn': 3, 'reversible': True})
@@ -208,12 +232,17 @@ class FbaModelAnalysisTestCase(unittest.TestCase):
                     ids.append(n.id)
                 if isinstance(n, wc_lang.Species):
                     # remove compartment suffix '[some_comp]'
-                    sp_type_id = n.id.split('[')[0]
+                    sp_type_id = n.id.partition('[')[0]
                     ids.append(sp_type_id)
             s_id, d_id = ids
             graph_edges.add((s_id, d_id))
         self.assertEqual(expected_edges, graph_edges)
 
+        # the digraph includes the species of the submodel, even if they don't participate in its reactions
+        g = self.model_analysis.get_digraph(self.dfba_submodel, species=self.species)
+        self.assertEqual(set(self.species) - set(g.nodes()), set())
+        self.assertEqual(self.model_analysis.unbounded_paths(g, self.species[0], [self.species[-1]]), [])
+
     def test_unbounded_paths(self):
         num_rxn = 8
 
@@ -251,7 +280,26 @@ class FbaModelAnalysisTestCase(unittest.TestCase):
                                                     min_non_finite_ub=self.default_flux_max+1)
         self.assertEqual(len(paths), 0)
 
+        # reversible reactions, with one bounded reaction on one side of ring -> only the path on the other side
+        self.create_reaction_network(self.dfba_submodel, 'ring', **{'num_rxn': num_rxn, 'reversible': True,
+                                                                    'flux_max': float('inf')})
+        bounded_rxn = self.dfba_submodel.reactions[1]
+        bounded_rxn.flux_bounds = wc_lang.FluxBounds(max=self.default_flux_max)
+        g = self.model_analysis.get_digraph(self.dfba_submodel)
+        paths = self.model_analysis.unbounded_paths(g, self.species[0], [self.species[num_rxn//2]],
+                                                    min_non_finite_ub=self.default_flux_max+1)
+        self.assertEqual(len(paths), 1)
+        self.assertEqual(len(paths[0]), num_rxn+1)
+        self.assertNotIn(bounded_rxn, paths[0])
+        self.assertEqual(paths[0][1], self.dfba_submodel.reactions[-1])
+
         # test exceptions
+        with self.assertRaisesRegex(ValueError, "'ex_species' .* is not a node in 'rxn_network'"):
+            self.model_analysis.unbounded_paths(g, self.species[-1], [self.species[0]])
+
+        with self.assertRaisesRegex(ValueError, "elements of 'obj_fn_species' should be nodes in 'rxn_network', but "):
+            self.model_analysis.unbounded_paths(g, self.species[0], [self.species[1], self.species[-1]])
+
         with self.assertRaisesRegex(ValueError, "'ex_species' should be a wc_lang.Species instance, but "):
             self.model_analysis.unbounded_paths(None, 'species', None)
 
@@ -259,8 +307,8 @@ class FbaModelAnalysisTestCase(unittest.TestCase):
             self.model_analysis.unbounded_paths(None, wc_lang.Species(), ['species'])
 
     def test_path_bounds_analysis(self):
-        # read a wc model
-        self.model = wc_lang.io.Reader().run(self.MODEL_FILENAME)[wc_lang.Model][0]
+        # copy the wc model
+        self.model = self.template_model.copy()
         self.dfba_submodel = self.model.submodels.get_one(id='submodel_1')
         self.model_analysis = wc_analysis.model.fba.FbaModelAnalysis(self.model)
 
@@ -286,3 +334,35 @@ class FbaModelAnalysisTestCase(unittest.TestCase):
             rxn.flux_bounds.max = float('inf')
         paths = self.model_analysis.path_bounds_analysis(self.dfba_submodel)
         self.assertEqual(len(paths['specie_1[e]']), 2)
+
+        # objective function species which aren't in the reaction network
+        rxn_participants = {rxn: wc_analysis.model.fba.RxnParticipants((), (), ()) for rxn in self.dfba_submodel.reactions}
+        with self.assertRaisesRegex(ValueError, "elements of 'obj_fn_species' should be nodes in 'rxn_network', but "):
+            self.model_analysis.path_bounds_analysis(self.dfba_submodel, species=[], rxn_participants=rxn_participants)
+
+    def test_run(self):
+        model = self.template_model.copy()
+        # add a submodel which isn't a dFBA submodel, and therefore has no dFBA objective
+        model.submodels.create(id='ssa_submodel', framework=onto['WC:stochastic_simulation_algorithm'])
+        dfba_submodels = [submodel for submodel in model.submodels
+                          if submodel.framework == onto['WC:dynamic_flux_balance_analysis']]
+        self.assertNotEqual(dfba_submodels, [])
+
+        # only the dFBA submodels are analyzed
+        model_analysis = wc_analysis.model.fba.FbaModelAnalysis(model)
+        with mock.patch.object(model_analysis, 'get_rxn_gaps', wraps=model_analysis.get_rxn_gaps) as get_rxn_gaps, \
+                mock.patch.object(model_analysis, 'path_bounds_analysis',
+                                  wraps=model_analysis.path_bounds_analysis) as path_bounds_analysis:
+            model_analysis.run()
+        self.assertEqual([args[0] for args, _ in get_rxn_gaps.call_args_list], dfba_submodels)
+        self.assertEqual([args[0] for args, _ in path_bounds_analysis.call_args_list], dfba_submodels)
+
+        runner = wc_analysis.core.AnalysisRunner(model=model, analyses=[wc_analysis.model.fba.FbaModelAnalysis])
+        runner.run()
+
+    def test_run_parallel(self):
+        # load the model in the worker processes
+        runner = wc_analysis.core.AnalysisRunner(analyses=[wc_analysis.model.fba.FbaModelAnalysis],
+                                                 options={'parallel': True, 'max_workers': 1,
+                                                          'model_loader': load_model})
+        runner.run()
@@ -13,6 +13,32 @@ import tempfile
 import unittest
 
 
+class ParallelKbAnalysis(core.KnowledgeBaseAnalysis):
+    def run(self):
+        with open(os.path.join(self.out_path, 'out.txt'), 'w') as file:
+            file.write(type(self).__name__)
+
+
+class ParallelModelAnalysis(core.ModelAnalysis):
+    def run(self):
+        with open(os.path.join(self.out_path, 'out.txt'), 'w') as file:
+            file.write(type(self).__name__)
+
+
+class LoadedModelAnalysis(core.ModelAnalysis):
+    def run(self):
+        with open(os.path.join(self.out_path, 'out.txt'), 'w') as file:
+            file.write('{} {}'.format(self.knowledge_base, self.model))
+
+
+def load_kb():
+    return 'loaded_kb'
+
+
+def load_model():
+    return 'loaded_model'
+
+
 class Test(unittest.TestCase):
     def setUp(self):
         self.dir = tempfile.mkdtemp()
@@ -36,6 +62,12 @@ class Test(unittest.TestCase):
         self.assertTrue(os.path.isdir(out_path))
         self.assertTrue(os.path.isfile(os.path.join(out_path, 'fig.pdf')))
 
+        test_analysis = TestAnalysis()
+        fig, axes = test_analysis.create_fig(rows=2, cols=3)
+        self.assertEqual(axes.shape, (2, 3))
+        with self.assertWarnsRegex(UserWarning, 'cannot be shown'):
+            test_analysis.show_or_save_fig(fig)
+
     def test_KnowledgeBaseAnalysis(self):
         class TestAnalysis(core.KnowledgeBaseAnalysis):
             def run(self):
@@ -60,6 +92,24 @@ class Test(unittest.TestCase):
         test_analysis = TestAnalysis(sim_results_path=self.dir, model=None, knowledge_base=None)
         test_analysis.run()
 
+    def test_slots(self):
+        class TestAnalysis(core.ModelAnalysis):
+            __slots__ = ()
+
+            def run(self):
+                pass
+
+        test_analysis = TestAnalysis(model='model')
+        self.assertEqual(test_analysis.model, 'model')
+        self.assertFalse(hasattr(test_analysis, '__dict__'))
+
+        # analyses can inherit from multiple types of analyses
+        class TestMultipleAnalysis(core.ModelAnalysis, core.SimulationAnalysis):
+            def run(self):
+                pass
+
+        self.assertTrue(issubclass(TestMultipleAnalysis, core.SimulationAnalysis))
+
     def test_AnalysisRunner_constructor(self):
         runner = core.AnalysisRunner(None, None, None)
         self.assertEqual(runner.analyses, ())
@@ -104,6 +154,60 @@ class Test(unittest.TestCase):
         self.assertTrue(os.path.isdir(os.path.join(self.dir, 'TestModelAnalysis')))
         self.assertTrue(os.path.isdir(os.path.join(self.dir, 'TestSimResultsAnalysis')))
 
+    def test_AnalysisRunner_parallel(self):
+        runner = core.AnalysisRunner(None, None, None, analyses=[
+            ParallelKbAnalysis, ParallelModelAnalysis,
+        ], out_path=self.dir, options={'parallel': True, 'max_workers': 2})
+        runner.run()
+        for analysis_cls in [ParallelKbAnalysis, ParallelModelAnalysis]:
+            with open(os.path.join(self.dir, analysis_cls.__name__, 'out.txt'), 'r') as file:
+                self.assertEqual(file.read(), analysis_cls.__name__)
+
+    def test_AnalysisRunner_loaders(self):
+        for parallel in [False, True]:
+            runner = core.AnalysisRunner('kb', 'model', None, analyses=[LoadedModelAnalysis], out_path=self.dir,
+                                         options={'parallel': parallel,
+                                                  'knowledge_base_loader': load_kb,
+                                                  'model_loader': load_model})
+            runner.run()
+            with open(os.path.join(self.dir, 'LoadedModelAnalysis', 'out.txt'), 'r') as file:
+                self.assertEqual(file.read(), 'loaded_kb loaded_model')
+
+    def test_AnalysisRunner_indirect_subclasses(self):
+        class BaseModelAnalysis(core.ModelAnalysis):
+            def run(self):
+                pass
+
+        class TestModelAnalysis(BaseModelAnalysis):
+            def run(self):
+                assert self.model == 'model'
+                assert self.knowledge_base == 'kb'
+
+        runner = core.AnalysisRunner('kb', 'model', None, analyses=[TestModelAnalysis, TestModelAnalysis])
+        runner.run()
+        runner.run()
+
+    def test_AnalysisRunner_registered_subclasses(self):
+        class BaseModelAnalysis(core.ModelAnalysis):
+            pass
+
+        class TestModelAnalysis(object):
+            def __init__(self, model, knowledge_base=None, out_path=None, options=None):
+                self.model = model
+                self.knowledge_base = knowledge_base
+
+            def run(self):
+                assert self.model == 'model'
+                assert self.knowledge_base == 'kb'
+
+        runner = core.AnalysisRunner('kb', 'model', None, analyses=[TestModelAnalysis])
+        with self.assertRaisesRegex(ValueError, 'Unsupported analysis of '):
+            runner.run()
+
+        # register the analysis with a local subclass to avoid modifying the registry of ModelAnalysis
+        BaseModelAnalysis.register(TestModelAnalysis)
+        runner.run()
+
     def test_AnalysisRunner_error(self):
         class TestAnalysis(core.Analysis):
             def run(self):
@@ -6,10 +6,12 @@
 :License: MIT
 """
 
-from matplotlib import pyplot
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import abc
-import matplotlib
+import concurrent.futures
 import os
+import warnings
 import wc_kb.core
 import wc_lang.core
 
@@ -17,11 +19,20 @@ import wc_lang.core
 class Analysis(object, metaclass=abc.ABCMeta):
     """ An analysis of a knowledge base, model, or simulation results
 
+    Figures are rendered by the non-interactive Agg backend. Therefore, figures can only be saved
+    to `out_path`; they can't be shown.
+
+    The slots of all types of analyses are declared here, rather than by the subclasses for each type,
+    so that analyses can inherit from multiple types. The analysis classes are abstract, so the slots
+    only avoid a per-instance :obj:`dict` for concrete subclasses which also declare `__slots__`.
+
     Attributes:
         out_path (:obj:`str`): optional path to save analysis
         options (:obj:`dict`): options
     """
 
+    __slots__ = ('out_path', 'options', 'knowledge_base', 'model', 'sim_results_path')
+
     def __init__(self, out_path=None, options=None):
         """
         Args:
@@ -31,8 +42,8 @@ class Analysis(object, metaclass=abc.ABCMeta):
         self.out_path = out_path
 
         # make the output directory if it doesn't exist
-        if out_path and not os.path.isdir(out_path):
-            os.makedirs(out_path)
+        if out_path:
+            os.makedirs(out_path, exist_ok=True)
 
         self.options = options or {}
         self.clean_and_validate_options()
@@ -49,6 +60,9 @@ class Analysis(object, metaclass=abc.ABCMeta):
     def create_fig(self, rows=1, cols=1):
         """ Create a figure composed of a grid of subfigures
 
+        The figure is rendered by the non-interactive Agg backend and isn't registered with
+        :obj:`matplotlib.pyplot`.
+
         Args:
             rows (:obj:`int`, optional): number of rows of subfigures
             cols (:obj:`int`, optional): number of columns of subfigures
@@ -57,10 +71,16 @@ class Analysis(object, metaclass=abc.ABCMeta):
             :obj:`matplotlib.figure.Figure`: figure
             :obj:`matplotlib.axes.Axes`: axes
         """
-        return pyplot.subplots(nrows=rows, ncols=cols)
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(nrows=rows, ncols=cols)
+        return fig, axes
 
     def show_or_save_fig(self, fig, filename=None):
-        """ Show or save a figure
+        """ Save a figure to `out_path`
+
+        Because figures are rendered by the non-interactive Agg backend, figures can't be shown. If
+        `out_path` is not set, a warning is issued instead.
 
         Args:
             fig (:obj:`matplotlib.figure.Figure`): figure
@@ -68,9 +88,9 @@ class Analysis(object, metaclass=abc.ABCMeta):
         """
         if self.out_path:
             fig.savefig(os.path.join(self.out_path, filename), transparent=True, bbox_inches='tight')
-            pyplot.close(fig)
         else:
-            fig.show()  # pragma: no cover
+            warnings.warn('Figures cannot be shown by the non-interactive Agg backend; set `out_path` to save them',
+                          UserWarning)
 
 
 class KnowledgeBaseAnalysis(Analysis):
@@ -80,6 +100,8 @@ class KnowledgeBaseAnalysis(Analysis):
         knowledge_base (:obj:`wc_kb.core.KnowledgeBase`): knowledge base
     """
 
+    __slots__ = ()
+
     def __init__(self, knowledge_base, out_path=None, options=None):
         """
         Args:
@@ -99,6 +121,8 @@ class ModelAnalysis(Analysis):
         knowledge_base (:obj:`wc_kb.core.KnowledgeBase`): knowledge base
     """
 
+    __slots__ = ()
+
     def __init__(self, model, knowledge_base=None, out_path=None, options=None):
         """
         Args:
@@ -121,6 +145,8 @@ class SimulationAnalysis(Analysis):
         knowledge_base (:obj:`wc_kb.core.KnowledgeBase`): knowledge base
     """
 
+    __slots__ = ()
+
     def __init__(self, sim_results_path, model=None, knowledge_base=None, out_path=None, options=None):
         """
         Args:
@@ -146,6 +172,16 @@ class AnalysisRunner(object):
         analyses (:obj:`list` of :obj:`Analysis`): analyses to run
         out_path (:obj:`str`):  path to save analyses
         options (:obj:`dict`): options
+
+            * analysis (:obj:`dict`): options for each analysis, keyed by the names of the analysis classes
+            * parallel (:obj:`bool`): if :obj:`True`, run the analyses concurrently in a pool of processes
+            * max_workers (:obj:`int`): maximum number of processes to use to run the analyses in parallel
+            * knowledge_base_loader (:obj:`callable`): picklable function without arguments which loads the
+              knowledge base; if set, each analysis loads the knowledge base with this function instead of
+              receiving `knowledge_base`, so that the knowledge base doesn't have to be pickled
+            * model_loader (:obj:`callable`): picklable function without arguments which loads the model;
+              if set, each analysis loads the model with this function instead of receiving `model`, so
+              that the model doesn't have to be pickled
     """
 
     DEFAULT_ANALYSES = ()
@@ -180,32 +216,121 @@ class AnalysisRunner(object):
     def run(self):
         """ Run multiple analyses
 
+        The analyses are run serially, or, if the `parallel` option is set, concurrently in a pool of
+        (at most `max_workers`) processes. To run the analyses in parallel, the analysis classes must
+        be picklable, and the knowledge base and model must either be picklable or be loaded in the
+        worker processes by the `knowledge_base_loader` and `model_loader` options.
+
         Raises:
             :obj:`ValueError`: if the analysis is not supported
         """
         options = self.options.get('analysis', {})
+        loaders = {}
+        if self.options.get('knowledge_base_loader', None) is not None:
+            loaders['knowledge_base'] = self.options['knowledge_base_loader']
+        if self.options.get('model_loader', None) is not None:
+            loaders['model'] = self.options['model_loader']
+
+        analyses = []
         for analysis_cls in self.analyses:
+            name = analysis_cls.__name__
             if self.out_path:
-                out_path = os.path.join(self.out_path, analysis_cls.__name__)
+                out_path = os.path.join(self.out_path, name)
             else:
                 out_path = None
 
-            if issubclass(analysis_cls, KnowledgeBaseAnalysis):
-                analysis = analysis_cls(knowledge_base=self.knowledge_base,
-                                        out_path=out_path,
-                                        options=options.get(analysis_cls.__name__, {}))
-            elif issubclass(analysis_cls, ModelAnalysis):
-                analysis = analysis_cls(knowledge_base=self.knowledge_base,
-                                        model=self.model,
-                                        out_path=out_path,
-                                        options=options.get(analysis_cls.__name__, {}))
-            elif issubclass(analysis_cls, SimulationAnalysis):
-                analysis = analysis_cls(knowledge_base=self.knowledge_base,
-                                        model=self.model,
-                                        sim_results_path=self.sim_results_path,
-                                        out_path=out_path,
-                                        options=options.get(analysis_cls.__name__, {}))
-            else:
-                raise ValueError('Unsupported analysis of type {}'.format(analysis_cls.__name__))
+            add_kwargs = _classify(analysis_cls)
+            if add_kwargs is None:
+                raise ValueError('Unsupported analysis of type {}'.format(name))
+            kwargs = {
+                'knowledge_base': self.knowledge_base,
+                'out_path': out_path,
+                'options': options.get(name, {}),
+            }
+            add_kwargs(self, kwargs)
+            for arg_name in loaders:
+                if arg_name in kwargs:
+                    kwargs[arg_name] = None
+
+            analyses.append((analysis_cls, kwargs))
+
+        if self.options.get('parallel', False):
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.options.get('max_workers', None)) as executor:
+                futures = [executor.submit(_run_one, analysis_cls, kwargs, loaders) for analysis_cls, kwargs in analyses]
+                for future in futures:
+                    future.result()
+        else:
+            for analysis_cls, kwargs in analyses:
+                _run_one(analysis_cls, kwargs, loaders)
+
+
+def _run_one(analysis_cls, kwargs, loaders=None):
+    """ Construct and run an analysis
+
+    Defined at the module level so that it can be pickled and run in a worker process.
+
+    Args:
+        analysis_cls (:obj:`type`): analysis class
+        kwargs (:obj:`dict`): arguments to the constructor of the analysis
+        loaders (:obj:`dict`, optional): functions which load the arguments to the constructor of the
+            analysis, keyed by the names of the arguments; only the arguments in `kwargs` are loaded
+    """
+    for arg_name, loader in (loaders or {}).items():
+        if arg_name in kwargs:
+            kwargs[arg_name] = loader()
+    analysis = analysis_cls(**kwargs)
+    analysis.run()
 
-            analysis.run()
+
+def _add_kb_kwargs(runner, kwargs):
+    """ Add the arguments specific to the constructors of knowledge base analyses
+
+    Knowledge base analyses only take the knowledge base, output path, and options, which are
+    common to all analyses.
+
+    Args:
+        runner (:obj:`AnalysisRunner`): runner
+        kwargs (:obj:`dict`): arguments to the constructor of the analysis
+    """
+    pass
+
+
+def _add_model_kwargs(runner, kwargs):
+    """ Add the arguments specific to the constructors of model analyses
+
+    Args:
+        runner (:obj:`AnalysisRunner`): runner
+        kwargs (:obj:`dict`): arguments to the constructor of the analysis
+    """
+    kwargs['model'] = runner.model
+
+
+def _add_sim_kwargs(runner, kwargs):
+    """ Add the arguments specific to the constructors of simulation analyses
+
+    Args:
+        runner (:obj:`AnalysisRunner`): runner
+        kwargs (:obj:`dict`): arguments to the constructor of the analysis
+    """
+    kwargs['model'] = runner.model
+    kwargs['sim_results_path'] = runner.sim_results_path
+
+
+def _classify(analysis_cls):
+    """ Get the function which adds the arguments specific to the constructor of an analysis class
+
+    Args:
+        analysis_cls (:obj:`type`): analysis class
+
+    Returns:
+        :obj:`types.FunctionType`: function which adds the arguments specific to the constructor of
+            `analysis_cls`, or :obj:`None` if `analysis_cls` is not a supported type of analysis
+    """
+    if issubclass(analysis_cls, KnowledgeBaseAnalysis):
+        return _add_kb_kwargs
+    elif issubclass(analysis_cls, ModelAnalysis):
+        return _add_model_kwargs
+    elif issubclass(analysis_cls, SimulationAnalysis):
+        return _add_sim_kwargs
+    else:
+        return None
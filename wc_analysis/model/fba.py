@@ -9,11 +9,39 @@
 
 from wc_analysis.core import ModelAnalysis
 from wc_onto import onto
+import collections
+import functools
 import networkx
 import wc_kb
 import wc_lang
 import wc_lang.config
 
+# bind the classes used in type checks in loops to module-level names to avoid attribute lookups
+_Species = wc_lang.Species
+_Reaction = wc_lang.Reaction
+
+
+@functools.lru_cache(maxsize=1)
+def _ex_compartment_id():
+    """ Get the id of the extracellular compartment from the configuration of `wc_lang`
+
+    Returns:
+        :obj:`str`: id of the extracellular compartment
+    """
+    return wc_lang.config.get_config()['wc_lang']['EXTRACELLULAR_COMPARTMENT_ID']
+
+
+class RxnParticipants(collections.namedtuple('RxnParticipants', ('reactants', 'products', 'participants'))):
+    """ The participants of a reaction, classified by :obj:`FbaModelAnalysis.get_rxn_participants`
+
+    Attributes:
+        reactants (:obj:`tuple` of :obj:`wc_lang.Species`): the participants with negative coefficients
+        products (:obj:`tuple` of :obj:`wc_lang.Species`): the participants with positive coefficients
+        participants (:obj:`tuple` of :obj:`wc_lang.Species`): all of the participants
+    """
+
+    __slots__ = ()
+
 
 class FbaModelAnalysis(ModelAnalysis):
     """ Statically analyze an FBA submodel
@@ -25,7 +53,7 @@ class FbaModelAnalysis(ModelAnalysis):
         submodel (:obj:`wc_lang.Submodel`): dFBA submodel
     """
 
-    def run(self, model, knowledge_base=None, out_path=None, options=None):
+    def __init__(self, model, knowledge_base=None, out_path=None, options=None):
         """
         Args:
             model (:obj:`wc_lang.Model`): model
@@ -36,12 +64,18 @@ class FbaModelAnalysis(ModelAnalysis):
         super(FbaModelAnalysis, self).__init__(model, knowledge_base=knowledge_base,
                                                out_path=out_path, options=options)
 
+    def run(self):
+        """ Analyze the dFBA submodels of the model """
+        bounded_rxns = self._get_bounded_rxns(self.model.reactions)
         for submodel in self.model.submodels:
-            if submodel.framework != onto['WC:dynamic_flux_balance_analysis']:
-                self.get_rxn_gaps(submodel)
-                self.path_bounds_analysis(submodel)
-
-    def get_rxn_gaps(self, submodel):
+            if submodel.framework == onto['WC:dynamic_flux_balance_analysis']:
+                species = list(submodel.get_children(kind='submodel', __type=wc_lang.Species))
+                rxn_participants = self.get_rxn_participants(submodel.reactions)
+                self.get_rxn_gaps(submodel, species=species, rxn_participants=rxn_participants)
+                self.path_bounds_analysis(submodel, species=species, bounded_rxns=bounded_rxns,
+                                          rxn_participants=rxn_participants)
+
+    def get_rxn_gaps(self, submodel, species=None, rxn_participants=None):
         """ Identify gaps in a dFBA submodel's reaction network
 
         Species that are not consumed or not produced indicate gaps in the reaction network.
@@ -61,25 +95,77 @@ class FbaModelAnalysis(ModelAnalysis):
                 delta_gap_species = all_gap_species - tmp_gap_species
             return (all_gap_species, all_gap_reactions)
 
+        This fixed point is computed incrementally with a worklist of newly found gap species. Each gap
+        species inactivates the reactions in which it participates, and each newly inactive reaction
+        is removed from the reactions which consume and produce its other participants, which can
+        make those participants gap species. Costs :math:`O(n*p)`, where :math:`n` is the number of
+        reactions in `submodel` and :math:`p` is the maximum number of participants in a reaction.
+
         Args:
             submodel (:obj:`wc_lang.Submodel`): dFBA submodel
+            species (:obj:`list` of :obj:`wc_lang.Species`, optional): the species in `submodel`; if not
+                provided, the species are obtained from `submodel`
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`, optional): map from each reaction
+                in `submodel` to its participants, as returned by `get_rxn_participants`; if not provided,
+                these are obtained from the reactions
 
         Returns:
             * :obj:`set` of :obj:`wc_lang.Species`: :obj:`wc_lang.Species` not in the minimal reaction network
             * :obj:`set` of :obj:`wc_lang.Reaction`: :obj:`wc_lang.Reaction`\ s not in the minimal reaction network
         """
-        all_dead_end_species = self.get_dead_end_species(submodel, set())
-        delta_dead_end_species = all_dead_end_species
+        if species is None:
+            species = list(submodel.get_children(kind='submodel', __type=wc_lang.Species))
+        if rxn_participants is None:
+            rxn_participants = self.get_rxn_participants(submodel.reactions)
+
+        # index the reactions in which each species participates, and the active reactions which
+        # consume and produce each species
+        participating_rxns = {specie: set() for specie in species}
+        consuming_rxns = {specie: set() for specie in species}
+        producing_rxns = {specie: set() for specie in species}
+        for rxn in submodel.reactions:
+            participants = rxn_participants[rxn]
+            if rxn.reversible:
+                reactants = products = participants.participants
+            else:
+                reactants = participants.reactants
+                products = participants.products
+            for specie in participants.participants:
+                if specie in participating_rxns:
+                    participating_rxns[specie].add(rxn)
+            for specie in reactants:
+                if specie in consuming_rxns:
+                    consuming_rxns[specie].add(rxn)
+            for specie in products:
+                if specie in producing_rxns:
+                    producing_rxns[specie].add(rxn)
+
+        not_consumed = set(specie for specie in species if not consuming_rxns[specie])
+        not_produced = set(specie for specie in species if not producing_rxns[specie])
         inactive_reactions = set()
-        while any(delta_dead_end_species):
-            inactive_reactions = self.get_inactive_rxns(submodel, all_dead_end_species)
-            tmp_not_consumed, tmp_not_produced = all_dead_end_species
-            all_dead_end_species = self.get_dead_end_species(submodel, inactive_reactions)
-            all_not_consumed, all_not_produced = all_dead_end_species
-            delta_dead_end_species = (all_not_consumed-tmp_not_consumed, all_not_produced-tmp_not_produced)
-        return (all_dead_end_species, inactive_reactions)
-
-    def get_dead_end_species(self, submodel, inactive_reactions):
+        dead_end_species = collections.deque(not_consumed | not_produced)
+        while dead_end_species:
+            dead_end_specie = dead_end_species.popleft()
+            for rxn in participating_rxns[dead_end_specie]:
+                if rxn in inactive_reactions:
+                    continue
+                inactive_reactions.add(rxn)
+                for specie in rxn_participants[rxn].participants:
+                    if specie not in participating_rxns:
+                        continue
+                    was_dead_end = specie in not_consumed or specie in not_produced
+                    consuming_rxns[specie].discard(rxn)
+                    producing_rxns[specie].discard(rxn)
+                    if not consuming_rxns[specie]:
+                        not_consumed.add(specie)
+                    if not producing_rxns[specie]:
+                        not_produced.add(specie)
+                    if not was_dead_end and (specie in not_consumed or specie in not_produced):
+                        dead_end_species.append(specie)
+
+        return ((not_consumed, not_produced), inactive_reactions)
+
+    def get_dead_end_species(self, submodel, inactive_reactions, species=None, rxn_participants=None):
         """ Find the dead end species in a reaction network
 
         Given a set of inactive reactions in submodel, determine species that are not consumed by
@@ -90,6 +176,11 @@ class FbaModelAnalysis(ModelAnalysis):
         Args:
             submodel (:obj:`wc_lang.Submodel`): dFBA submodel
             inactive_reactions (:obj:`set` of :obj:`wc_lang.Reaction`): the inactive reactions in `submodel`
+            species (:obj:`list` of :obj:`wc_lang.Species`, optional): the species in `submodel`; if not
+                provided, the species are obtained from `submodel`
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`, optional): map from each reaction
+                in `submodel` to its participants, as returned by `get_rxn_participants`; if not provided,
+                these are obtained from the reactions
 
         Returns:
             :obj:`tuple`:
@@ -97,25 +188,114 @@ class FbaModelAnalysis(ModelAnalysis):
                 * :obj:`set` of :obj:`wc_lang.Species`: the species that are not consumed
                 * :obj:`set` of :obj:`wc_lang.Species`: the species that are not produced
         """
-        species = submodel.get_children(kind='submodel', __type=wc_lang.Species)
-        species_not_consumed = set(species)
-        species_not_produced = set(species)
+        if species is None:
+            species = submodel.get_children(kind='submodel', __type=wc_lang.Species)
+        all_species = set(species)
+        if rxn_participants is None:
+            rxn_participants = self.get_rxn_participants(submodel.reactions)
+        consumed_species, produced_species = self._get_consumed_and_produced_species(
+            submodel, inactive_reactions, rxn_participants)
+        return (all_species - consumed_species, all_species - produced_species)
+
+    def iter_dead_end_species(self, submodel, inactive_reactions, species=None, rxn_participants=None):
+        """ Iterate over the dead end species in a reaction network
+
+        Generates the species found by `get_dead_end_species`, without building the sets of species
+        which are not consumed and not produced. The sets of species which are consumed and produced
+        by the active reactions are still built before the first species is generated.
+
+        Args:
+            submodel (:obj:`wc_lang.Submodel`): dFBA submodel
+            inactive_reactions (:obj:`set` of :obj:`wc_lang.Reaction`): the inactive reactions in `submodel`
+            species (:obj:`list` of :obj:`wc_lang.Species`, optional): the species in `submodel`; if not
+                provided, the species are obtained from `submodel`
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`, optional): map from each reaction
+                in `submodel` to its participants, as returned by `get_rxn_participants`; if not provided,
+                these are obtained from the reactions
+
+        Yields:
+            :obj:`tuple`:
+
+                * :obj:`wc_lang.Species`: a dead end species
+                * :obj:`bool`: whether the species is not consumed
+                * :obj:`bool`: whether the species is not produced
+        """
+        if rxn_participants is None:
+            rxn_participants = self.get_rxn_participants(submodel.reactions)
+        consumed_species, produced_species = self._get_consumed_and_produced_species(
+            submodel, inactive_reactions, rxn_participants)
+        if species is None:
+            species = submodel.get_children(kind='submodel', __type=wc_lang.Species)
+        for specie in species:
+            not_consumed = specie not in consumed_species
+            not_produced = specie not in produced_species
+            if not_consumed or not_produced:
+                yield (specie, not_consumed, not_produced)
+
+    def _get_consumed_and_produced_species(self, submodel, inactive_reactions, rxn_participants):
+        """ Find the species which are consumed and produced by the active reactions in a reaction network
+
+        Args:
+            submodel (:obj:`wc_lang.Submodel`): dFBA submodel
+            inactive_reactions (:obj:`set` of :obj:`wc_lang.Reaction`): the inactive reactions in `submodel`
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`): map from each reaction in `submodel`
+                to its participants, as returned by `get_rxn_participants`
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`set` of :obj:`wc_lang.Species`: the species that are consumed
+                * :obj:`set` of :obj:`wc_lang.Species`: the species that are produced
+        """
+        # ensure that the membership tests below are constant time, even if a list of reactions is given
+        if not isinstance(inactive_reactions, (set, frozenset)):
+            inactive_reactions = set(inactive_reactions)
+
+        consumed_species = set()
+        produced_species = set()
         for rxn in submodel.reactions:
             if rxn in inactive_reactions:
                 continue
+            participants = rxn_participants[rxn]
             if rxn.reversible:
-                for part in rxn.participants:
-                    species_not_consumed.discard(part.species)
-                    species_not_produced.discard(part.species)
+                consumed_species.update(participants.participants)
+                produced_species.update(participants.participants)
             else:
-                for part in rxn.participants:
-                    if part.coefficient < 0:
-                        species_not_consumed.discard(part.species)
-                    elif 0 < part.coefficient:
-                        species_not_produced.discard(part.species)
-        return (species_not_consumed, species_not_produced)
-
-    def get_inactive_rxns(self, submodel, dead_end_species):
+                consumed_species.update(participants.reactants)
+                produced_species.update(participants.products)
+        return (consumed_species, produced_species)
+
+    def get_rxn_participants(self, reactions):
+        """ Classify the participants of reactions as reactants and products
+
+        Classifying the participants once lets the analyses of a submodel share the classification,
+        rather than each re-reading the coefficients of the participants.
+
+        Args:
+            reactions (:obj:`list` of :obj:`wc_lang.Reaction`): reactions
+
+        Returns:
+            :obj:`dict` of :obj:`RxnParticipants`: map from each reaction to its reactants, products, and
+            participants, each without duplicates
+        """
+        rxn_participants = {}
+        for rxn in reactions:
+            reactants = []
+            products = []
+            participants = []
+            for part in rxn.participants:
+                if part.coefficient < 0:
+                    reactants.append(part.species)
+                elif 0 < part.coefficient:
+                    products.append(part.species)
+                participants.append(part.species)
+            # use the keys of dictionaries to remove duplicates, preserving the order of the participants
+            rxn_participants[rxn] = RxnParticipants(reactants=tuple(dict.fromkeys(reactants)),
+                                                    products=tuple(dict.fromkeys(products)),
+                                                    participants=tuple(dict.fromkeys(participants)))
+        return rxn_participants
+
+    def get_inactive_rxns(self, submodel, dead_end_species, rxn_participants=None):
         """ Find the inactive reactions in a reaction network
 
         Given the dead end species in a reaction network, find the reactions that must eventually
@@ -131,21 +311,24 @@ class FbaModelAnalysis(ModelAnalysis):
 
                 * :obj:`set` of :obj:`wc_lang.Species`: the `Species` that are not consumed by any `Reaction` in `submodel`
                 * :obj:`set` of :obj:`wc_lang.Species`: the `Species` that are not produced by any `Reaction` in `submodel`
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`, optional): map from each reaction
+                in `submodel` to its participants, as returned by `get_rxn_participants`; if not provided,
+                these are obtained from the reactions
 
         Returns:
             :obj:`set` of :obj:`wc_lang.Reaction`: the inactive reactions in `submodel`'s reaction network
         """
         species_not_consumed, species_not_produced = dead_end_species
-        inactive_reactions = []
+        all_dead_end_species = species_not_consumed | species_not_produced
+        if rxn_participants is None:
+            rxn_participants = self.get_rxn_participants(submodel.reactions)
+        inactive_reactions = set()
         for rxn in submodel.reactions:
-            for part in rxn.participants:
-                if (part.species in species_not_consumed or
-                        part.species in species_not_produced):
-                    inactive_reactions.append(rxn)
-                    break
+            if not all_dead_end_species.isdisjoint(rxn_participants[rxn].participants):
+                inactive_reactions.add(rxn)
         return inactive_reactions
 
-    def get_digraph(self, submodel):
+    def get_digraph(self, submodel, species=None, rxn_participants=None):
         """ Create a NetworkX network representing the reaction network in `submodel`
 
         To leverage the algorithms in NetworkX, map a reaction network on to a NetworkX
@@ -156,37 +339,156 @@ class FbaModelAnalysis(ModelAnalysis):
 
         Args:
             submodel (:obj:`wc_lang.Submodel`): dFBA submodel
+            species (:obj:`list` of :obj:`wc_lang.Species`, optional): the species in `submodel`; if not
+                provided, the species are obtained from `submodel`
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`, optional): map from each reaction
+                in `submodel` to its participants, as returned by `get_rxn_participants`; if not provided,
+                these are obtained from the reactions
 
         Returns:
             :obj:`networkx.DiGraph`: a NetworkX directed graph representing `submodel`'s reaction network
         """
-        digraph = networkx.DiGraph()
-
         # make network of obj_tables.Model instances
-        for specie in submodel.get_children(kind='submodel', __type=wc_lang.Species):
-            digraph.add_node(specie)
-        for rxn in submodel.reactions:
-            digraph.add_node(rxn)
-            for participant in rxn.participants:
-                part = participant.species
-                if participant.coefficient < 0:
-                    # reactant
-                    digraph.add_edge(part, rxn)
-                elif 0 < participant.coefficient:
-                    # product
-                    digraph.add_edge(rxn, part)
-            if rxn.reversible:
-                for participant in rxn.participants:
-                    part = participant.species
-                    if participant.coefficient < 0:
-                        # product
-                        digraph.add_edge(rxn, part)
-                    elif 0 < participant.coefficient:
-                        # reactant
-                        digraph.add_edge(part, rxn)
+        if species is None:
+            species = submodel.get_children(kind='submodel', __type=wc_lang.Species)
+        if rxn_participants is None:
+            rxn_participants = self.get_rxn_participants(submodel.reactions)
+        digraph = networkx.DiGraph()
+        digraph.add_nodes_from(species)
+        digraph.add_nodes_from(submodel.reactions)
+        digraph.add_edges_from(self._iter_rxn_network_edges(submodel.reactions, rxn_participants))
         return digraph
 
-    def path_bounds_analysis(self, submodel):
+    def _iter_rxn_network_edges(self, reactions, rxn_participants):
+        """ Iterate over the edges of the bipartite digraph of a reaction network
+
+        Args:
+            reactions (:obj:`list` of :obj:`wc_lang.Reaction`): reactions
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`): map from each reaction to its
+                participants, as returned by `get_rxn_participants`
+
+        Yields:
+            :obj:`tuple`: an edge from a reactant `Species` to a `Reaction`, or from a `Reaction` to
+            a product `Species`
+        """
+        for rxn in reactions:
+            participants = rxn_participants[rxn]
+            for part in participants.reactants:
+                # reactant, or product of the reverse reaction
+                yield (part, rxn)
+                if rxn.reversible:
+                    yield (rxn, part)
+            for part in participants.products:
+                # product, or reactant of the reverse reaction
+                yield (rxn, part)
+                if rxn.reversible:
+                    yield (part, rxn)
+
+    def _index_rxn_network(self, nodes, edges):
+        """ Index the nodes of a reaction network by contiguous integers
+
+        Represent the reaction network as lists indexed by the integer ids of its nodes, which are
+        cheaper to search than a NetworkX digraph of :obj:`obj_tables.Model` instances.
+
+        Args:
+            nodes (:obj:`list` of :obj:`object`): nodes of the reaction network
+            edges (:obj:`iterable` of :obj:`tuple`): edges of the reaction network; the nodes of edges
+                which are not in `nodes` are added
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`list` of :obj:`object`: the nodes, in the order of their ids
+                * :obj:`dict`: map from nodes to their ids
+                * :obj:`list` of :obj:`list` of :obj:`int`: the ids of the successors of each node
+                * :obj:`list` of :obj:`list` of :obj:`int`: the ids of the predecessors of each node
+        """
+        nodes = list(dict.fromkeys(nodes))
+        node_ids = {node: i_node for i_node, node in enumerate(nodes)}
+        successors = [dict() for node in nodes]
+        for edge in edges:
+            for node in edge:
+                if node not in node_ids:
+                    node_ids[node] = len(nodes)
+                    nodes.append(node)
+                    successors.append(dict())
+            # use the keys of dictionaries as ordered sets
+            successors[node_ids[edge[0]]][node_ids[edge[1]]] = None
+        successors = [list(node_successors) for node_successors in successors]
+        predecessors = [[] for node in nodes]
+        for i_node, node_successors in enumerate(successors):
+            for i_successor in node_successors:
+                predecessors[i_successor].append(i_node)
+        return (nodes, node_ids, successors, predecessors)
+
+    def _get_reaching_nodes(self, predecessors, bounded, target):
+        """ Find the nodes of an indexed reaction network from which a node can be reached without
+        passing through reactions with finite flux upper bounds
+
+        Uses a reverse depth-first search from `target`, which costs :math:`O(V+E)`.
+
+        Args:
+            predecessors (:obj:`list` of :obj:`list` of :obj:`int`): the ids of the predecessors of each node
+            bounded (:obj:`bytearray`): whether each node is a reaction with a finite flux upper bound
+            target (:obj:`int`): id of the node
+
+        Returns:
+            :obj:`bytearray`: whether `target` can be reached from each node without passing through
+            reactions with finite flux upper bounds
+        """
+        reaching = bytearray(len(predecessors))
+        reaching[target] = True
+        stack = [target]
+        while stack:
+            for i_pred in predecessors[stack.pop()]:
+                if not reaching[i_pred] and not bounded[i_pred]:
+                    reaching[i_pred] = True
+                    stack.append(i_pred)
+        return reaching
+
+    def _iter_unbounded_paths(self, successors, reaching, source, target):
+        """ Iterate over the simple paths between two nodes of an indexed reaction network which don't
+        pass through reactions with finite flux upper bounds
+
+        Uses a depth-first search, modeled on NetworkX's `all_simple_paths`, which is pruned at
+        the nodes from which `target` can't be reached without passing through reactions with finite
+        flux upper bounds. In particular, no search is needed if `target` can't be reached from `source`.
+
+        Args:
+            successors (:obj:`list` of :obj:`list` of :obj:`int`): the ids of the successors of each node
+            reaching (:obj:`bytearray`): whether `target` can be reached from each node without passing
+                through reactions with finite flux upper bounds, as determined by `_get_reaching_nodes`
+            source (:obj:`int`): id of the first node of the paths
+            target (:obj:`int`): id of the last node of the paths
+
+        Yields:
+            :obj:`list` of :obj:`int`: the ids of the nodes of a path
+        """
+        if not reaching[source]:
+            return
+
+        path = [source]
+        visited = bytearray(len(successors))
+        visited[source] = True
+        stack = [iter(successors[source])]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                visited[path.pop()] = False
+            elif visited[child]:
+                continue
+            elif child == target:
+                yield path + [child]
+            elif not reaching[child]:
+                continue
+            else:
+                path.append(child)
+                visited[child] = True
+                stack.append(iter(successors[child]))
+
+    def path_bounds_analysis(self, submodel, min_non_finite_ub=1000.0, species=None, bounded_rxns=None,
+                             rxn_participants=None):
         """ Perform path bounds analysis on `submodel`
 
         To be adequately constrained, a dFBA metabolic model should have the property that each path
@@ -198,27 +500,86 @@ class FbaModelAnalysis(ModelAnalysis):
 
         Args:
             submodel (:obj:`wc_lang.Submodel`): dFBA submodel
+            min_non_finite_ub (:obj:`float`, optional): flux upper bounds less than `min_non_finite_ub`
+                are considered finite
+            species (:obj:`list` of :obj:`wc_lang.Species`, optional): the species in `submodel`; if not
+                provided, the species are obtained from `submodel`
+            bounded_rxns (:obj:`frozenset` of :obj:`wc_lang.Reaction`, optional): the reactions with finite
+                flux upper bounds; if not provided, these are determined from `min_non_finite_ub`
+            rxn_participants (:obj:`dict` of :obj:`RxnParticipants`, optional): map from each reaction
+                in `submodel` to its participants, as returned by `get_rxn_participants`; if not provided,
+                these are obtained from the reactions
 
         Returns:
             :obj:`dict` of :obj:`list` of :obj:`list` of :obj:`object`: paths from extracellular species to objective
             function components that lack a finite flux upper bound. Keys in the `dict` are the ids
             of extracellular species; the corresponding values contain the unbounded paths for the
             extracellular species, as returned by `unbounded_paths`.
+
+        Raises:
+            :obj:`ValueError`: if an objective function species is not a node in `submodel`'s reaction network
         """
         # todo: symmetrically, report reactions not on any path from ex species to obj fun components
-        config = wc_lang.config.get_config()['wc_lang']
-        digraph = self.get_digraph(submodel)
+        if species is None:
+            species = list(submodel.get_children(kind='submodel', __type=wc_lang.Species))
         obj_fn_species = submodel.dfba_obj.get_products()
-        ex_compartment = submodel.model.compartments.get_one(id=config['EXTRACELLULAR_COMPARTMENT_ID'])
-        ex_species = filter(lambda species: species.compartment == ex_compartment,
-                            submodel.get_children(kind='submodel', __type=wc_lang.Species))
+        ex_compartment = submodel.model.compartments.get_one(id=_ex_compartment_id())
+        ex_species = [specie for specie in species if specie.compartment is ex_compartment]
+        if bounded_rxns is None:
+            bounded_rxns = self._get_bounded_rxns(submodel.reactions, min_non_finite_ub=min_non_finite_ub)
+        if rxn_participants is None:
+            rxn_participants = self.get_rxn_participants(submodel.reactions)
+        nodes, node_ids, successors, predecessors = self._index_rxn_network(
+            species + list(submodel.reactions), self._iter_rxn_network_edges(submodel.reactions, rxn_participants))
+        self._check_rxn_network_nodes(node_ids, ex_species, obj_fn_species)
+        bounded = bytearray(node in bounded_rxns for node in nodes)
+        reaching = {of_specie: self._get_reaching_nodes(predecessors, bounded, node_ids[of_specie])
+                    for of_specie in obj_fn_species}
         all_unbounded_paths = dict()
         for ex_specie in ex_species:
-            paths = self.unbounded_paths(digraph, ex_specie, obj_fn_species)
+            paths = []
+            for of_specie in obj_fn_species:
+                for path in self._iter_unbounded_paths(successors, reaching[of_specie],
+                                                       node_ids[ex_specie], node_ids[of_specie]):
+                    paths.append([nodes[i_node] for i_node in path])
             all_unbounded_paths[ex_specie.id] = paths
         return all_unbounded_paths
 
-    def unbounded_paths(self, rxn_network, ex_species, obj_fn_species, min_non_finite_ub=1000.0):
+    def _check_rxn_network_nodes(self, rxn_network_nodes, ex_species, obj_fn_species):
+        """ Check that extracellular and objective function species are nodes in a reaction network
+
+        Args:
+            rxn_network_nodes (:obj:`collections.abc.Container`): the nodes of the reaction network
+            ex_species (:obj:`list` of :obj:`wc_lang.Species`): extracellular species
+            obj_fn_species (:obj:`list` of :obj:`wc_lang.Species`): objective function species
+
+        Raises:
+            :obj:`ValueError`: if an element of `ex_species` or `obj_fn_species` is not a node in the
+                reaction network
+        """
+        missing_specie = next((ex_specie for ex_specie in ex_species if ex_specie not in rxn_network_nodes), None)
+        if missing_specie is not None:
+            raise ValueError("'ex_species' {} is not a node in 'rxn_network'".format(missing_specie.id))
+        missing_specie = next((of_specie for of_specie in obj_fn_species if of_specie not in rxn_network_nodes), None)
+        if missing_specie is not None:
+            raise ValueError("elements of 'obj_fn_species' should be nodes in 'rxn_network', but {} is not".format(
+                missing_specie.id))
+
+    def _get_bounded_rxns(self, reactions, min_non_finite_ub=1000.0):
+        """ Find the reactions with finite flux upper bounds
+
+        Args:
+            reactions (:obj:`iterable` of :obj:`wc_lang.Reaction`): reactions
+            min_non_finite_ub (:obj:`float`, optional): flux upper bounds less than `min_non_finite_ub`
+                are considered finite
+
+        Returns:
+            :obj:`frozenset` of :obj:`wc_lang.Reaction`: the reactions with finite flux upper bounds
+        """
+        return frozenset(rxn for rxn in reactions
+                         if rxn.flux_bounds and rxn.flux_bounds.max < min_non_finite_ub)
+
+    def unbounded_paths(self, rxn_network, ex_species, obj_fn_species, min_non_finite_ub=1000.0, bounded_rxns=None):
         """ Find the unbounded paths from an extracellular species to some objective function species
 
         Return all paths in a reaction network that lack a finite flux upper bound
@@ -234,6 +595,8 @@ class FbaModelAnalysis(ModelAnalysis):
                 upper bound
             min_non_finite_ub (:obj:`float`, optional): flux upper bounds less than `min_non_finite_ub`
                 are considered finite
+            bounded_rxns (:obj:`frozenset` of :obj:`wc_lang.Reaction`, optional): the reactions in `rxn_network`
+                with finite flux upper bounds; if not provided, these are determined from `min_non_finite_ub`
 
         Returns:
             :obj:`list` of :obj:`list` of :obj:`object`: a list of the reaction paths from `ex_species`
@@ -243,25 +606,32 @@ class FbaModelAnalysis(ModelAnalysis):
 
         Raises:
             :obj:`ValueError`: if `ex_species` is not an instance of :obj:`wc_lang.Species` or `obj_fn_species`
-                is not a list of instances of :obj:`wc_lang.Species`
+                is not a list of instances of :obj:`wc_lang.Species`, or if `ex_species` or an element of
+                `obj_fn_species` is not a node in `rxn_network`
         """
         # todo: replace the constant in min_non_finite_ub=1000.0
-        unbounded_paths = list()
-        if not isinstance(ex_species, wc_lang.Species):
+        if not isinstance(ex_species, _Species):
             raise ValueError("'ex_species' should be a wc_lang.Species instance, but it is a {}".format(
                 type(ex_species).__name__))
+        invalid_type = next((type(of_specie) for of_specie in obj_fn_species if not isinstance(of_specie, _Species)), None)
+        if invalid_type is not None:
+            raise ValueError("elements of 'obj_fn_species' should be wc_lang.Species instances, but one is a {}".format(
+                invalid_type.__name__))
+        if not obj_fn_species:
+            return []
+        self._check_rxn_network_nodes(rxn_network, [ex_species], obj_fn_species)
+
+        nodes, node_ids, successors, predecessors = self._index_rxn_network(rxn_network.nodes(), rxn_network.edges())
+
+        if bounded_rxns is None:
+            bounded_rxns = self._get_bounded_rxns((node for node in nodes if isinstance(node, _Reaction)),
+                                                  min_non_finite_ub=min_non_finite_ub)
+        bounded = bytearray(node in bounded_rxns for node in nodes)
+
+        unbounded_paths = list()
         for of_specie in obj_fn_species:
-            if not isinstance(of_specie, wc_lang.Species):
-                raise ValueError("elements of 'obj_fn_species' should be wc_lang.Species instances, but one is a {}".format(
-                    type(of_specie).__name__))
-            for path in networkx.all_simple_paths(rxn_network, source=ex_species, target=of_specie):
-                # path is a list of Species, Reaction, ..., Species
-                bounded = False
-                for i in range(1, len(path), 2):
-                    rxn = path[i]
-                    if rxn.flux_bounds and rxn.flux_bounds.max < min_non_finite_ub:
-                        bounded = True
-                        break
-                if not bounded:
-                    unbounded_paths.append(path)
+            reaching = self._get_reaching_nodes(predecessors, bounded, node_ids[of_specie])
+            # path is a list of Species, Reaction, ..., Species
+            for path in self._iter_unbounded_paths(successors, reaching, node_ids[ex_species], node_ids[of_specie]):
+                unbounded_paths.append([nodes[i_node] for i_node in path])
         return unbounded_paths